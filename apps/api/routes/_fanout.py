@@ -0,0 +1,20 @@
+"""
+Shared per-symbol fan-out for API routes (/api/state, /api/plan/all).
+
+One process-wide pool: /api/state is polled, so a pool per request would
+spawn and tear down threads on every poll. Results keep input order.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List
+
+MAX_WORKERS = 8
+
+_POOL = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="api-fanout")
+
+
+def map_symbols(fn: Callable[[str], Any], symbols: Iterable[str]) -> List[Any]:
+    """fn(sym) for every symbol, in order; runs inline for 0–1 symbols."""
+    symbols = list(symbols)
+    if len(symbols) <= 1:
+        return [fn(sym) for sym in symbols]
+    return list(_POOL.map(fn, symbols))
@@ -22,17 +22,32 @@ SESSION_FILE: Path = (
 )
 
 
+# (mtime_ns, size) -> parsed session; /status is polled by the UI and the
+# file only changes on login.
+_SESSION_CACHE: dict = {}
+
+
 def _load_session() -> dict | None:
     """Load stored Kite session from disk, or None."""
-    if not SESSION_FILE.exists():
+    try:
+        st = SESSION_FILE.stat()
+    except OSError:
         return None
+
+    key = (st.st_mtime_ns, st.st_size)
+    if _SESSION_CACHE.get("key") == key:
+        return _SESSION_CACHE["data"]
+
     try:
         with SESSION_FILE.open("r", encoding="utf-8") as f:
             data = json.load(f)
-        return data
     except Exception:
         return None
 
+    _SESSION_CACHE["key"] = key
+    _SESSION_CACHE["data"] = data
+    return data
+
 
 def _save_session(sess: dict) -> None:
     """Persist Kite session to disk."""
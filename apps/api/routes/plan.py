@@ -7,6 +7,7 @@ from probedge.decision.plan_core import build_parity_plan
 from probedge.infra.settings import SETTINGS
 from probedge.storage.atomic_json import AtomicJSON
 from probedge.storage.resolver import state_path
+from ._fanout import map_symbols
 
 router = APIRouter()
 
@@ -68,10 +69,10 @@ def api_plan_all(
     """
     day_resolved = _resolve_day_for_plan(day)
     symbols = SETTINGS.symbols
-    plans: List[Dict[str, Any]] = []
-    for sym in symbols:
-        plan = build_parity_plan(sym, day_resolved)
-        plans.append(plan)
+    # Per-symbol plans are independent; overlap their CSV loads, keep order.
+    plans: List[Dict[str, Any]] = map_symbols(
+        lambda sym: build_parity_plan(sym, day_resolved), symbols
+    )
 
     return {
         "date": day_resolved,
@@ -16,6 +16,7 @@ from probedge.infra.settings import SETTINGS
 from probedge.infra.logger import get_logger
 from probedge.storage.atomic_json import AtomicJSON
 from probedge.decision.plan_core import build_parity_plan
+from ._fanout import map_symbols
 
 log = get_logger(__name__)
 router = APIRouter()
@@ -133,26 +134,22 @@ def _build_raw_plans_for_day(day_str: Optional[str]) -> List[Dict[str, Any]]:
     - None         → builder uses latest available day per symbol
     """
     symbols = SETTINGS.symbols
-    raw: List[Dict[str, Any]] = []
 
-    for sym in symbols:
+    def _one(sym: str) -> Dict[str, Any]:
         try:
-            plan = build_parity_plan(sym, day_str)
+            return build_parity_plan(sym, day_str)
         except HTTPException as exc:
             # If tm5 / master missing, mark as ABSTAIN and continue
             log.warning("build_parity_plan failed for %s: %s", sym, exc)
-            raw.append(
-                {
-                    "symbol": sym,
-                    "pick": "ABSTAIN",
-                    "reason": f"PLAN_ERROR: {exc.detail}",
-                }
-            )
-            continue
-
-        raw.append(plan)
+            return {
+                "symbol": sym,
+                "pick": "ABSTAIN",
+                "reason": f"PLAN_ERROR: {exc.detail}",
+            }
 
-    return raw
+    # Symbols are independent (separate TM5/MASTER files): overlap their
+    # CSV loads and keep the result in SETTINGS.symbols order.
+    return map_symbols(_one, symbols)
 
 def _apply_portfolio_split(
     raw_plans: List[Dict[str, Any]],
@@ -42,12 +42,10 @@ def get_last_dt_from_csv(csv_path: str) -> datetime | None:
 
 def to_ist_naive(series: pd.Series) -> pd.Series:
     dt = pd.to_datetime(series, errors="coerce")
-    # If tz-aware, convert to IST then drop tz
-    try:
-        if getattr(dt.dt, "tz", None) is not None:
-            dt = dt.dt.tz_convert(IST).dt.tz_localize(None)
-    except Exception:
-        pass
+    # If tz-aware, convert to IST then drop tz (dtype check, no exceptions;
+    # mixed-offset object results are returned as-is like before)
+    if isinstance(dt.dtype, pd.DatetimeTZDtype):
+        dt = dt.dt.tz_convert(IST).dt.tz_localize(None)
     return dt
 
 def fetch_5m_range(kite: KiteConnect, token: int, start_dt: datetime, end_dt: datetime) -> pd.DataFrame:
@@ -91,7 +89,7 @@ def normalize_to_date_time_cols(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     df["DateTime"] = pd.to_datetime(df["DateTime"], errors="coerce")
     df = df.dropna(subset=["DateTime"]).sort_values("DateTime")
-    df["date"] = df["DateTime"].dt.strftime("%Y-%m-%d")
+    df["date"] = df["DateTime"].to_numpy(dtype="datetime64[D]").astype(str)
     df["time"] = df["DateTime"].dt.strftime("%H:%M:%S")
     out = df[["date","time","Open","High","Low","Close","Volume"]].copy()
     out.columns = ["date","time","open","high","low","close","volume"]
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta, date
 from pathlib import Path
 from typing import Dict, List
 
+import numpy as np
 import pandas as pd
 from kiteconnect import KiteConnect
 
@@ -68,14 +69,10 @@ def build_token_map(kite: KiteConnect, symbols: List[str]) -> Dict[str, int]:
     return out
 
 
-def daterange(start: date, end: date) -> List[date]:
-    # inclusive [start, end]
-    days: List[date] = []
-    d = start
-    while d <= end:
-        days.append(d)
-        d += timedelta(days=1)
-    return days
+def weekdays_between(start: date, end: date) -> List[date]:
+    # Mon–Fri dates in [start, end] inclusive; weekends are dropped here
+    days = np.arange(start, end + timedelta(days=1), dtype="datetime64[D]")
+    return days[np.is_busday(days)].tolist()
 
 
 def fetch_day_1m(kite: KiteConnect, sym: str, token: int, day: date) -> pd.DataFrame:
@@ -123,11 +120,7 @@ def main():
 
     OUT_ROOT.mkdir(parents=True, exist_ok=True)
 
-    for d in daterange(start_day, end_day):
-        # Skip weekends
-        if d.weekday() >= 5:
-            continue
-
+    for d in weekdays_between(start_day, end_day):
         day_dir = OUT_ROOT / d.strftime("%Y-%m-%d")
         day_dir.mkdir(parents=True, exist_ok=True)
 
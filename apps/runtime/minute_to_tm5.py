@@ -22,25 +22,19 @@ def tm5_path_for_symbol(sym: str) -> Path:
     pattern = SETTINGS.paths.intraday or "data/intraday/{sym}_5minute.csv"
     return Path(pattern.format(sym=sym))
 
-def process_day_for_symbol(day_str: str, sym: str) -> None:
+def _build_5m_for_day(day_str: str, sym: str):
     """
-    Build / update {sym}_5minute.csv for a single day.
-    If the 1-minute file for that day is missing, we just log and return.
+    Resample one day's 1-minute file to 5-minute bars.
+    Returns None (after logging) if the 1m file for that day is missing.
     """
-    day = pd.to_datetime(day_str).date()
-
-    # 1m input and 5m output paths
     minute_path = os.path.join(
         "data", "hist_1m", day_str, f"{sym}_1minute.csv"
     )
-    tm5_path = os.path.join(
-        "data", "intraday", f"{sym}_5minute.csv"
-    )
 
     # If no 1m file, skip this symbol/day cleanly
     if not os.path.exists(minute_path):
         log.warning("[minute_to_tm5] missing 1m file %s", minute_path)
-        return
+        return None
 
     # --- build 5m from the 1m file ---
     df_1 = pd.read_csv(minute_path)
@@ -58,10 +52,11 @@ def process_day_for_symbol(day_str: str, sym: str) -> None:
     df_1["DateTime"] = dt
     df_1 = df_1.sort_values("DateTime")
 
-    # 5-minute resample on DateTime
-    df_1 = df_1.set_index("DateTime")
+    # 5-minute buckets (left-closed, left-labelled) from a single floor key;
+    # only populated buckets are produced, so no empty-bin padding.
+    key = df_1["DateTime"].dt.floor("5min")
 
-    ohlcv = df_1.resample("5min", label="left", closed="left").agg(
+    ohlcv = df_1.groupby(key).agg(
         {
             "open": "first" if "open" in df_1.columns else "first",
             "high": "max"   if "high" in df_1.columns else "max",
@@ -75,24 +70,56 @@ def process_day_for_symbol(day_str: str, sym: str) -> None:
 
     df_5 = ohlcv.reset_index()  # DateTime back as a column
     df_5["Date"] = df_5["DateTime"].dt.normalize()
+    return df_5
+
+
+def process_days_for_symbol(day_strs, sym: str) -> None:
+    """
+    Build / update {sym}_5minute.csv for a batch of days.
+    The TM5 file is read, de-duped for every rebuilt day and written once,
+    instead of once per day. Days without a 1m file are logged and skipped.
+    """
+    built = []
+    for day_str in day_strs:
+        df_5 = _build_5m_for_day(day_str, sym)
+        if df_5 is not None:
+            built.append((day_str, df_5))
+    if not built:
+        return
 
-    # --- merge into existing TM5 (if any), de-duping this day ---
+    tm5_path = os.path.join(
+        "data", "intraday", f"{sym}_5minute.csv"
+    )
+    days = [pd.to_datetime(d).date() for d, _ in built]
+
+    # --- merge into existing TM5 (if any), de-duping the rebuilt days ---
     if os.path.exists(tm5_path):
         existing = pd.read_csv(tm5_path)
 
         if "Date" in existing.columns:
             existing["Date"] = pd.to_datetime(existing["Date"]).dt.normalize()
-            existing = existing[existing["Date"] != pd.to_datetime(day)]
+            existing = existing[~existing["Date"].isin(pd.to_datetime(days))]
         elif "DateTime" in existing.columns:
             dt_existing = pd.to_datetime(existing["DateTime"])
-            existing = existing[dt_existing.dt.date != day]
+            existing = existing[~dt_existing.dt.date.isin(days)]
 
-        combined = pd.concat([existing, df_5], ignore_index=True)
+        combined = pd.concat([existing] + [df_5 for _, df_5 in built], ignore_index=True)
     else:
-        combined = df_5
+        combined = pd.concat([df_5 for _, df_5 in built], ignore_index=True)
 
     combined.to_csv(tm5_path, index=False)
-    log.info("[minute_to_tm5] updated %s with day %s", tm5_path, day_str)
+    log.info(
+        "[minute_to_tm5] updated %s with %d day(s) %s..%s",
+        tm5_path, len(built), built[0][0], built[-1][0],
+    )
+
+
+def process_day_for_symbol(day_str: str, sym: str) -> None:
+    """
+    Build / update {sym}_5minute.csv for a single day.
+    If the 1-minute file for that day is missing, we just log and return.
+    """
+    process_days_for_symbol([day_str], sym)
 
 
 def main():
@@ -114,15 +141,15 @@ def main():
     end   = "2025-09-30"
     # ----------------------------------------------------
 
-    days = pd.date_range(start=start, end=end, freq="D")
-    for d in days:
-        day_str = d.strftime("%Y-%m-%d")
-        day_dir = HIST_ROOT / day_str
-        if not day_dir.exists():
-            continue
+    # Day strings formatted once; only days that were actually fetched.
+    day_strs = [
+        d for d in pd.date_range(start=start, end=end, freq="D").strftime("%Y-%m-%d")
+        if (HIST_ROOT / d).exists()
+    ]
 
-        for sym in symbols:
-            process_day_for_symbol(day_str, sym)
+    # One read/merge/write of each TM5 file for the whole range.
+    for sym in symbols:
+        process_days_for_symbol(day_strs, sym)
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 
 from datetime import timedelta
@@ -13,12 +14,14 @@ def _last_weekday(d):
     return d
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from kiteconnect import KiteConnect
 
 
 from probedge.infra.settings import SETTINGS
 from probedge.storage.resolver import intraday_path
+from probedge.infra.ratelimit import kite_hist_limiter
 
 TOKENS_PATH = Path("data/tokens_5min.csv")
 
@@ -28,6 +31,10 @@ N_DAYS = int(os.environ.get("PROBEDGE_INTRADAY_DAYS_BACK", DEFAULT_DAYS_BACK))
 
 SESSION_START = "09:15:00"   # keep full trading session from here
 
+# parallel symbol refreshes; every historical_data call is still paced by
+# the shared kite_hist_limiter (~3 req/s)
+N_WORKERS = int(os.environ.get("PROBEDGE_INTRADAY_WORKERS", 3))
+
 
 def make_kite() -> KiteConnect:
     api_key = SETTINGS.kite_api_key
@@ -70,8 +77,9 @@ def load_tokens():
     if not TOKENS_PATH.exists():
         raise FileNotFoundError(f"Missing {TOKENS_PATH}. Run build_tokens_5min first.")
     df = pd.read_csv(TOKENS_PATH)
-    df["symbol"] = df["symbol"].astype(str).str.upper()
-    return {row["symbol"]: int(row["instrument_token"]) for _, row in df.iterrows()}
+    syms = df["symbol"].astype(str).str.upper().tolist()
+    toks = df["instrument_token"].astype("int64").tolist()
+    return dict(zip(syms, toks))
 
 
 def fetch_5min_from_kite(kite, instrument_token: int, start: date, end: date) -> pd.DataFrame:
@@ -87,6 +95,7 @@ def fetch_5min_from_kite(kite, instrument_token: int, start: date, end: date) ->
         chunk_end = min(cursor + timedelta(days=99), end)
         print(f"[intraday] fetching {instrument_token} {cursor} → {chunk_end}")
 
+        kite_hist_limiter.wait()
         candles = kite.historical_data(
             instrument_token=instrument_token,
             from_date=cursor,
@@ -104,14 +113,21 @@ def fetch_5min_from_kite(kite, instrument_token: int, start: date, end: date) ->
             columns=["date", "time", "open", "high", "low", "close", "volume"]
         )
 
-    df = pd.DataFrame(all_candles)
-
-    # Kite returns a 'date' column with full timestamp
-    df["date"] = pd.to_datetime(df["date"])
-    df["time"] = df["date"].dt.strftime("%H:%M:%S")
-    df["date"] = df["date"].dt.date
-
-    df = df[["date", "time", "open", "high", "low", "close", "volume"]]
+    # Kite returns 'date' as tz-aware (IST) datetime objects already, so build
+    # typed columns straight from the candles instead of re-parsing them.
+    n = len(all_candles)
+    stamps = [c["date"] for c in all_candles]
+    df = pd.DataFrame(
+        {
+            "date": [ts.date() for ts in stamps],
+            "time": [ts.strftime("%H:%M:%S") for ts in stamps],
+            "open": np.fromiter((c["open"] for c in all_candles), dtype=np.float64, count=n),
+            "high": np.fromiter((c["high"] for c in all_candles), dtype=np.float64, count=n),
+            "low": np.fromiter((c["low"] for c in all_candles), dtype=np.float64, count=n),
+            "close": np.fromiter((c["close"] for c in all_candles), dtype=np.float64, count=n),
+            "volume": np.fromiter((c["volume"] for c in all_candles), dtype=np.int64, count=n),
+        }
+    )
     return df
 
 
@@ -138,7 +154,7 @@ def refresh_symbol(sym: str, kite: KiteConnect, instrument_token: int, cutoff: d
             raw_date = cur[date_col].astype(str).str.slice(0, 10)
             cur["date"] = pd.to_datetime(raw_date, errors="coerce").dt.date
             cur = cur.dropna(subset=["date"])
-            keep = cur[cur["date"] < cutoff].copy()
+            keep = cur[cur["date"] < cutoff]
             print(f"[intraday] {sym}: keeping {len(keep)} old rows (< {cutoff})")
         else:
             print(f"[intraday] {sym}: WARNING no date/datetime column in {path}, starting fresh")
@@ -161,11 +177,10 @@ def refresh_symbol(sym: str, kite: KiteConnect, instrument_token: int, cutoff: d
     # sort by date + time just to be safe
     combined["date"] = pd.to_datetime(combined["date"])
     combined = combined.sort_values(["date", "time"])
-    # convert date back to YYYY-MM-DD string
-    combined["date"] = combined["date"].dt.strftime("%Y-%m-%d")
 
     path.parent.mkdir(parents=True, exist_ok=True)
-    combined.to_csv(path, index=False)
+    # date goes out as YYYY-MM-DD via the CSV writer (no strftime string column)
+    combined.to_csv(path, index=False, date_format="%Y-%m-%d")
     print(f"[intraday] {sym}: wrote {len(combined)} rows to {path}")
 
 
@@ -177,12 +192,22 @@ def main():
     cutoff = today - timedelta(days=N_DAYS)
     print(f"[intraday] Refreshing last {N_DAYS} days from {cutoff} to {today}")
 
+    todo = []
     for sym in SETTINGS.symbols:
         logical = sym.upper()
         if logical not in tokens:
             print(f"[intraday] WARNING: no token for {logical}, skipping")
             continue
-        refresh_symbol(logical, kite, tokens[logical], cutoff)
+        todo.append(logical)
+
+    # Each symbol is an independent Kite fetch + CSV rewrite (I/O bound), so
+    # run a few at once; the request rate is capped by kite_hist_limiter in
+    # fetch_5min_from_kite, not by the pool size.
+    workers = max(1, min(N_WORKERS, len(todo) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futs = [ex.submit(refresh_symbol, sym, kite, tokens[sym], cutoff) for sym in todo]
+        for fut in futs:
+            fut.result()
 
     print("[intraday] Done.")
 
@@ -9,7 +9,7 @@ import pandas as pd
 
 from probedge.infra.logger import get_logger
 from probedge.infra.settings import SETTINGS
-from probedge.infra.loaders import read_tm5_csv, by_day_map
+from probedge.infra.loaders import read_tm5_csv
 from probedge.storage.atomic_json import AtomicJSON
 from probedge.storage.resolver import intraday_path
 from apps.runtime.daily_timeline import arm_portfolio_for_day
@@ -129,9 +129,10 @@ def _load_intraday_for_day(sim_day: str) -> Dict[str, pd.DataFrame]:
     for sym in SETTINGS.symbols:
         p = intraday_path(sym)
         df = read_tm5_csv(str(p))
-        by_day = by_day_map(df)
-        df_day = by_day.get(day_norm)
-        if df_day is None or df_day.empty:
+        # read_tm5_csv returns rows sorted by DateTime with a normalized Date,
+        # so one mask gives sim_day's bars in order (no per-day groups).
+        df_day = df[df["Date"] == day_norm].reset_index(drop=True)
+        if df_day.empty:
             log.warning("SIM: no intraday for %s on %s", sym, sim_day)
             continue
         frames[sym] = df_day
@@ -0,0 +1,52 @@
+"""
+First-touch scan used by exec_adapter._earliest_touch_times.
+
+numba is optional (`pip install probedge[fast]`): when present the scan is a
+single compiled pass over High/Low that stops once stop, T1 and T2 have all
+been touched; otherwise the same indices come from vectorized numpy.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba not installed; numpy fallback below
+    njit = None
+
+
+def _touch_scan_loop(hi, lo, stop, t1, t2, long):
+    i_stop = i_t1 = i_t2 = -1
+    for i in range(hi.shape[0]):
+        h = hi[i]
+        l = lo[i]
+        if long:
+            if i_stop < 0 and l <= stop:
+                i_stop = i
+            if i_t1 < 0 and h >= t1:
+                i_t1 = i
+            if i_t2 < 0 and h >= t2:
+                i_t2 = i
+        else:
+            if i_stop < 0 and h >= stop:
+                i_stop = i
+            if i_t1 < 0 and l <= t1:
+                i_t1 = i
+            if i_t2 < 0 and l <= t2:
+                i_t2 = i
+        if i_stop >= 0 and i_t1 >= 0 and i_t2 >= 0:
+            break
+    return i_stop, i_t1, i_t2
+
+
+def _touch_scan_np(hi, lo, stop, t1, t2, long):
+    if long:
+        conds = (lo <= stop, hi >= t1, hi >= t2)
+    else:
+        conds = (hi >= stop, lo <= t1, lo <= t2)
+    return tuple(int(np.argmax(c)) if c.any() else -1 for c in conds)
+
+
+# (i_stop, i_t1, i_t2): first bar index touching each level, -1 if never.
+# No fastmath: NaN bars must never count as a touch.
+touch_scan = njit(cache=True)(_touch_scan_loop) if njit is not None else _touch_scan_np
@@ -1,6 +1,7 @@
 
 from __future__ import annotations
 
+import os
 from typing import Dict
 from pathlib import Path
 from datetime import time as dtime
@@ -10,6 +11,10 @@ import pandas as pd
 from probedge.infra.settings import SETTINGS
 from probedge.infra.logger import get_logger
 from probedge.storage.resolver import ALIASES as SYMBOL_ALIASES
+from probedge.backtest._touch_njit import touch_scan
+
+
+_INTRADAY_ROOT: Path | None = None
 
 
 def _intraday_root() -> Path:
@@ -19,15 +24,21 @@ def _intraday_root() -> Path:
       - <DATA_DIR>/data/intraday   (normal live layout)
       - <DATA_DIR>/intraday        (backtest layout)
     """
+    global _INTRADAY_ROOT
+    if _INTRADAY_ROOT is not None:
+        return _INTRADAY_ROOT
+
     root = Path(SETTINGS.data_dir)
     candidates = [
         root / "data" / "intraday",
         root / "intraday",
     ]
     for p in candidates:
-        if p.exists() and p.is_dir():
+        if p.is_dir():
+            # DATA_DIR is fixed per process; remember the resolved layout.
+            _INTRADAY_ROOT = p
             return p
-    # fallback: first candidate, even if it doesn't exist yet
+    # fallback: first candidate, even if it doesn't exist yet (not cached)
     return candidates[0]
 
 
@@ -55,15 +66,42 @@ def _load_tm5_for_day(symbol: str, day_date: pd.Timestamp) -> pd.DataFrame:
         path,
     )
 
-    df_all = _read_tm5(str(path))
+    df_all, dates = _read_tm5_cached(str(path))
 
-
-    dseries = pd.to_datetime(df_all["Date"], errors="coerce").dt.normalize()
-    mask = dseries.eq(pd.to_datetime(day_date).normalize())
-    df_day = df_all.loc[mask].copy()
+    # Date is sorted (frame is sorted by DateTime): the day is one block.
+    day64 = np.datetime64(pd.to_datetime(day_date).normalize().to_datetime64(), "ns")
+    lo = int(np.searchsorted(dates, day64, side="left"))
+    hi = int(np.searchsorted(dates, day64, side="right"))
+    df_day = df_all.iloc[lo:hi].copy()
     return df_day
 
 
+# path -> ((mtime_ns, size), parsed frame, its Date as datetime64[ns])
+_TM5_CACHE: Dict[str, tuple] = {}
+
+
+def _read_tm5_cached(path: str) -> tuple:
+    """
+    _read_tm5 memoized per path on (mtime, size), so simulating many trades
+    on the same symbol parses its CSV once. Returns (frame, sorted Date
+    values); callers must slice/copy rather than mutate the frame.
+    """
+    try:
+        st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None
+    hit = _TM5_CACHE.get(path)
+    if key is not None and hit is not None and hit[0] == key:
+        return hit[1], hit[2]
+
+    df = _read_tm5(path)
+    dates = df["Date"].to_numpy(dtype="datetime64[ns]")
+    if key is not None:
+        _TM5_CACHE[path] = (key, df, dates)
+    return df, dates
+
+
 
 log = get_logger(__name__)
 
@@ -72,6 +110,16 @@ T0_M = 9 * 60 + 40  # 09:40
 T1_M = 15 * 60 + 5  # 15:05
 
 
+# Canonical OHLCV name -> lower-case aliases, in priority order.
+_OHLCV_ALIASES = (
+    ("Open", ("open", "o")),
+    ("High", ("high", "h")),
+    ("Low", ("low", "l")),
+    ("Close", ("close", "c")),
+    ("Volume", ("volume", "vol", "qty", "quantity")),
+)
+
+
 def _read_tm5(path: str) -> pd.DataFrame:
     """
     Robust 5-minute reader, aligned with the new minute_to_tm5 output.
@@ -163,27 +211,17 @@ def _read_tm5(path: str) -> pd.DataFrame:
     else:
         df.insert(0, "DateTime", dt)
 
-    # Map OHLCV with some aliases
-    def pick(*aliases):
+    # Map OHLCV with some aliases (first alias present wins), one rename
+    ren = {}
+    for canon, aliases in _OHLCV_ALIASES:
         for a in aliases:
-            if a in lc2orig:
-                return lc2orig[a]
-        for c in df.columns:
-            if c.lower() in aliases:
-                return c
-        return None
-
-    col_map = {
-        "Open": pick("open", "o"),
-        "High": pick("high", "h"),
-        "Low": pick("low", "l"),
-        "Close": pick("close", "c"),
-        "Volume": pick("volume", "vol", "qty", "quantity"),
-    }
-
-    for k, v in col_map.items():
-        if v and v != k:
-            df.rename(columns={v: k}, inplace=True)
+            src = lc2orig.get(a)
+            if src is not None:
+                if src != canon:
+                    ren[src] = canon
+                break
+    if ren:
+        df = df.rename(columns=ren)
 
     for k in ("Open", "High", "Low", "Close", "Volume"):
         if k in df.columns:
@@ -228,22 +266,13 @@ def _earliest_touch_times(
     if win is None or win.empty:
         return {"stop": None, "t1": None, "t2": None}
 
-    hi = win["High"].to_numpy(dtype=float)
-    lo = win["Low"].to_numpy(dtype=float)
+    hi = np.ascontiguousarray(win["High"].to_numpy(dtype=np.float64))
+    lo = np.ascontiguousarray(win["Low"].to_numpy(dtype=np.float64))
     ts = win["DateTime"].to_numpy()
 
-    if long:
-        cond_stop = lo <= stop
-        cond_t1 = hi >= t1
-        cond_t2 = hi >= t2
-    else:
-        cond_stop = hi >= stop
-        cond_t1 = lo <= t1
-        cond_t2 = lo <= t2
-
-    i_stop = np.argmax(cond_stop) if np.any(cond_stop) else -1
-    i_t1 = np.argmax(cond_t1) if np.any(cond_t1) else -1
-    i_t2 = np.argmax(cond_t2) if np.any(cond_t2) else -1
+    i_stop, i_t1, i_t2 = touch_scan(
+        hi, lo, float(stop), float(t1), float(t2), bool(long)
+    )
 
     return {
         "stop": ts[i_stop] if i_stop >= 0 else None,
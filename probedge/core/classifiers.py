@@ -47,13 +47,9 @@ def _to_dt_series(s: pd.Series) -> pd.Series:
     This avoids 'tz-aware vs tz-naive' comparison issues.
     """
     s = pd.to_datetime(s, errors="coerce")
-    # If tz-aware, convert to naive
-    try:
-        if s.dt.tz is not None:
-            s = s.dt.tz_localize(None)
-    except AttributeError:
-        # non-datetime series or already naive
-        pass
+    # If tz-aware, convert to naive (non-datetime/object results pass through)
+    if isinstance(s.dtype, pd.DatetimeTZDtype):
+        s = s.dt.tz_localize(None)
     return s
 
 
@@ -1,4 +1,5 @@
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 
 # DO NOT change manual terminal code. Live imports it as the source of truth.
 from apps.api.routes._freq_select import apply_lookback, select_hist_batch_parity
@@ -31,7 +32,11 @@ def freq_pick(day, master: pd.DataFrame, tags_override: dict | None = None):
 
     # Try to read tags from today's master row if available
     ot = ol = pdc = ""
-    m_date = pd.to_datetime(master["Date"], errors="coerce").dt.normalize()
+    # _load_master_cached already parses Date; don't re-convert it per call.
+    m_date = master["Date"]
+    if not is_datetime64_any_dtype(m_date):
+        m_date = pd.to_datetime(m_date, errors="coerce")
+    m_date = m_date.dt.normalize()
     mrow = master.loc[m_date == day]
 
     if not mrow.empty:
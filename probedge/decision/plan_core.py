@@ -1,10 +1,12 @@
 import math
+import os
 from dataclasses import dataclass
 from datetime import date, datetime, time as dtime
 from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 
 from probedge.storage.resolver import locate_for_read
 from probedge.infra.constants import CLOSE_PCT, CLOSE_FR_ORB
@@ -32,6 +34,26 @@ def _is_close(a: float, b: float, entry_px: float, orb_rng: float) -> bool:
     return (np.isfinite(a) and np.isfinite(b)) and abs(a - b) <= thr
 
 
+def _try_import_tag_fns():
+    # Try probedge.core.classifiers first (your single source of truth),
+    # then probedge.decision.classifiers_robust if you kept the fns there.
+    for modname in ("probedge.core.classifiers", "probedge.decision.classifiers_robust"):
+        try:
+            mod = __import__(modname, fromlist=["*"])
+            pdc_fn = getattr(mod, "compute_prevdaycontext_robust", None)
+            ol_fn  = getattr(mod, "compute_openlocation_from_df", None)
+            ot_fn  = getattr(mod, "compute_openingtrend_robust", None)
+            if pdc_fn or ol_fn or ot_fn:
+                return pdc_fn, ol_fn, ot_fn
+        except Exception:
+            continue
+    return None, None, None
+
+
+# Resolved once at import rather than on every plan build.
+_TAG_FNS = _try_import_tag_fns()
+
+
 def _effective_daily_risk_rs() -> int:
     """
     Daily risk budget:
@@ -43,13 +65,34 @@ def _effective_daily_risk_rs() -> int:
     return int(getattr(SETTINGS, "risk_budget_rs", 10000))
 
 
+# path -> ((mtime_ns, size), frame); the planner is polled far more often
+# than a new 5m bar lands, so skip the CSV parse when the file is unchanged.
+_TM5_CACHE: Dict[str, Any] = {}
+_MASTER_CACHE: Dict[str, Any] = {}
+
+
+def _stat_key(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 def _load_tm5_flex(path: str) -> pd.DataFrame:
     """
     Single source of truth TM5 loader for the planner.
 
     Uses infra.loaders.read_tm5_csv so that /api/state, /api/plan/*,
     backtests etc all see identical intraday bars (DateTime, Date, OHLC).
+    Parsed frames are cached per path on (mtime, size); callers get a
+    shallow copy so adding columns never leaks back into the cache.
     """
+    key = _stat_key(path)
+    hit = _TM5_CACHE.get(path)
+    if key is not None and hit is not None and hit[0] == key:
+        return hit[1].copy(deep=False)
+
     logger.info("[_load_tm5_flex] reading tm5 via read_tm5_csv: %s", path)
     df = read_tm5_csv(path)
 
@@ -57,7 +100,29 @@ def _load_tm5_flex(path: str) -> pd.DataFrame:
     if "Date" not in df.columns:
         df["Date"] = df["DateTime"].dt.date
 
-    return df
+    if key is not None:
+        _TM5_CACHE[path] = (key, df)
+    return df.copy(deep=False)
+
+def _load_master_cached(path: str) -> pd.DataFrame:
+    """
+    Read a MASTER CSV, reusing the parsed frame while the file is unchanged.
+
+    Date is parsed to datetime64 once here, so the per-call lookups in
+    build_parity_plan / freq_pick / apply_lookback don't re-parse strings.
+    """
+    key = _stat_key(path)
+    hit = _MASTER_CACHE.get(path)
+    if key is not None and hit is not None and hit[0] == key:
+        return hit[1].copy(deep=False)
+
+    df = pd.read_csv(path)
+    if "Date" in df.columns:
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    if key is not None:
+        _MASTER_CACHE[path] = (key, df)
+    return df.copy(deep=False)
+
 
 def build_parity_plan(symbol: str, day_str: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -201,54 +266,38 @@ def build_parity_plan(symbol: str, day_str: Optional[str] = None) -> Dict[str, A
     prev_l = float(prev_ohlc["low"]) if prev_ohlc and "low" in prev_ohlc else np.nan
 
     # ---------- CTO FIX: compute tags from TM5 (fallback when MASTER row missing) ----------
-    tags_override = dict(tags)
-
-    def _try_import_tag_fns():
-        # Try probedge.core.classifiers first (your single source of truth),
-        # then probedge.decision.classifiers_robust if you kept the fns there.
-        for modname in ("probedge.core.classifiers", "probedge.decision.classifiers_robust"):
-            try:
-                mod = __import__(modname, fromlist=["*"])
-                pdc_fn = getattr(mod, "compute_prevdaycontext_robust", None)
-                ol_fn  = getattr(mod, "compute_openlocation_from_df", None)
-                ot_fn  = getattr(mod, "compute_openingtrend_robust", None)
-                if pdc_fn or ol_fn or ot_fn:
-                    return pdc_fn, ol_fn, ot_fn
-            except Exception:
-                continue
-        return None, None, None
-
-    pdc_fn, ol_fn, ot_fn = _try_import_tag_fns()
-
-    try:
-        if prev_ohlc is not None and pdc_fn:
-            tags_override["PrevDayContext"] = str(pdc_fn(prev_ohlc) or "")
-    except Exception:
-        pass
-
-    try:
-        if prev_ohlc is not None and ol_fn:
-            tags_override["OpenLocation"] = str(ol_fn(tm5, day_norm, prev_ohlc) or "")
-    except Exception:
-        pass
-
-    # OpeningTrend function signatures can vary; try a few safe patterns
-    if ot_fn:
-        for args in (
-            (tm5, day_norm, prev_ohlc),
-            (tm5, day_norm),
-            (df_day, prev_ohlc),
-            (df_day,),
-        ):
-            try:
-                v = ot_fn(*args)
-                if v is not None:
-                    tags_override["OpeningTrend"] = str(v or "")
-                    break
-            except TypeError:
-                continue
-            except Exception:
-                continue
+    pdc_fn, ol_fn, ot_fn = _TAG_FNS
+
+    # Only needed when MASTER has no row for the day, so it is evaluated lazily
+    # at the points below that actually fall back to it.
+    def _tag(name: str, fn, *args) -> str:
+        # One classifier's failure blanks only its own tag.
+        try:
+            return str(fn(*args) or "")
+        except Exception as e:
+            logger.warning(
+                "[build_parity_plan] %s computation failed for %s %s: %s",
+                name,
+                sym_upper,
+                day_norm.date(),
+                e,
+            )
+            return ""
+
+    def _fallback_tags() -> Dict[str, str]:
+        # Gate each classifier on its inputs instead of using exceptions as
+        # control flow. df_day is already the effective day's slice, so OL/OT
+        # use the (df_day[, prev_ohlc]) form and skip re-filtering tm5.
+        ready_prev = prev_ohlc is not None
+        return {
+            "OpeningTrend": _tag("OpeningTrend", ot_fn, df_day) if ot_fn else "",
+            "OpenLocation": (
+                _tag("OpenLocation", ol_fn, df_day, prev_ohlc) if (ready_prev and ol_fn) else ""
+            ),
+            "PrevDayContext": (
+                _tag("PrevDayContext", pdc_fn, prev_ohlc) if (ready_prev and pdc_fn) else ""
+            ),
+        }
 
     # ---------- Load master for freq pick & tags ----------
     p_master = locate_for_read("masters", sym_upper)
@@ -257,7 +306,7 @@ def build_parity_plan(symbol: str, day_str: Optional[str] = None) -> Dict[str, A
             "symbol": sym_upper,
             "date": requested_day_str,
             "effective_data_day": effective_data_day_str,
-            "tags": tags_override,
+            "tags": _fallback_tags(),
             "pick": "ABSTAIN",
             "confidence%": 0,
             "skip": "no_master",
@@ -266,13 +315,13 @@ def build_parity_plan(symbol: str, day_str: Optional[str] = None) -> Dict[str, A
         }
 
     try:
-        master = pd.read_csv(p_master)
+        master = _load_master_cached(str(p_master))
     except Exception as e:
         return {
             "symbol": sym_upper,
             "date": requested_day_str,
             "effective_data_day": effective_data_day_str,
-            "tags": tags_override,
+            "tags": _fallback_tags(),
             "pick": "ABSTAIN",
             "confidence%": 0,
             "skip": "master_read_error",
@@ -280,10 +329,10 @@ def build_parity_plan(symbol: str, day_str: Optional[str] = None) -> Dict[str, A
             "parity_mode": True,
         }
 
-    # Override tags from MASTER row if present; else use computed tags_override
+    # Override tags from MASTER row if present; else fall back to TM5-computed tags
     try:
         if "Date" in master.columns:
-            mdates = pd.to_datetime(master["Date"], errors="coerce").dt.normalize()
+            mdates = master["Date"].dt.normalize()
             row_today = master.loc[mdates == day_norm]
             if not row_today.empty:
                 r = row_today.iloc[0]
@@ -293,9 +342,9 @@ def build_parity_plan(symbol: str, day_str: Optional[str] = None) -> Dict[str, A
                     "PrevDayContext": str(r.get("PrevDayContext", "") or ""),
                 }
             else:
-                tags = dict(tags_override)
+                tags = _fallback_tags()
         else:
-            tags = dict(tags_override)
+            tags = _fallback_tags()
     except Exception as e:
         logger.warning(
             "[build_parity_plan] failed to override tags from MASTER for %s %s: %s",
@@ -303,7 +352,7 @@ def build_parity_plan(symbol: str, day_str: Optional[str] = None) -> Dict[str, A
             day_norm.date(),
             e,
         )
-        tags = dict(tags_override)
+        tags = _fallback_tags()
 
     # ---------- Freq pick using MASTER, with fallback tags override ----------
     pick, conf_pct, reason, level, stats = freq_pick(day_norm, master, tags_override=tags)
@@ -327,7 +376,9 @@ def build_parity_plan(symbol: str, day_str: Optional[str] = None) -> Dict[str, A
     if "_mins" in df_day.columns:
         w_orb = df_day[(df_day["_mins"] >= 9 * 60 + 15) & (df_day["_mins"] <= 9 * 60 + 35)]
     else:
-        dt = pd.to_datetime(df_day["DateTime"])
+        dt = df_day["DateTime"]
+        if not is_datetime64_any_dtype(dt):
+            dt = pd.to_datetime(dt)
         mins = dt.dt.hour * 60 + dt.dt.minute
         w_orb = df_day[(mins >= 9 * 60 + 15) & (mins <= 9 * 60 + 35)]
 
@@ -26,31 +26,36 @@ BASE_PATHS = getattr(SETTINGS, 'paths', None)
 INTRA = Path(getattr(BASE_PATHS, 'intraday', 'data/intraday'))
 MAST  = Path(getattr(BASE_PATHS, 'master',  'data/masters'))
 
-def _read_intraday(sym: str) -> pd.DataFrame:
-    p = _intraday_path(sym)
-    df = pd.read_csv(p)
-    # permissive normalize
-    cols = {c.lower(): c for c in df.columns}
-    def c(x): return cols.get(x.lower(), x)
-    df = df.rename(columns={
-        c("DateTime"): "DateTime",
-        c("Open"): "Open", c("High"): "High",
-        c("Low"): "Low",  c("Close"): "Close"
-    })
-    # Parse timezone-aware or naive; keep as pandas Timestamps
-    df["DateTime"] = pd.to_datetime(df["DateTime"], errors="coerce")
-    df["Date"] = df["DateTime"].dt.normalize()
-    return df.dropna(subset=["DateTime","Open","High","Low","Close"]).sort_values("DateTime").reset_index(drop=True)
+def _to_naive_ist(dtser):
+    dt = pd.to_datetime(dtser, errors="coerce", utc=False)
+    if isinstance(dt.dtype, pd.DatetimeTZDtype):
+        dt = dt.dt.tz_convert("Asia/Kolkata").dt.tz_localize(None)
+    return dt
 
-def _read_master(sym: str) -> pd.DataFrame:
-    p = _master_path(sym)
-    if not p.exists():
-        return pd.DataFrame(columns=["Date","OpeningTrend","OpenLocation","PrevDayContext","Result"])
-    df = pd.read_csv(p)
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.normalize()
-    for k in ("OpeningTrend","OpenLocation","PrevDayContext","Result"):
+def _read_intraday(symbol: str):
+    pth = _intraday_path(symbol)
+    df = pd.read_csv(pth)
+    if "DateTime" in df.columns:
+        dt = _to_naive_ist(df["DateTime"])
+    elif "Date" in df.columns:
+        dt = _to_naive_ist(df["Date"])
+    else:
+        raise ValueError("intraday csv must have DateTime or Date")
+    df["DateTime"] = dt
+    df["Date"] = dt.dt.normalize()
+    for k in ("Open","High","Low","Close","Ticks","Volume"):
         if k in df.columns:
-            df[k] = df[k].astype(str).str.strip().str.upper().replace({"NAN":""})
+            df[k] = pd.to_numeric(df[k], errors="coerce")
+    df = df.dropna(subset=["DateTime","Open","High","Low","Close"]).sort_values("DateTime").reset_index(drop=True)
+    return df
+
+def _read_master(symbol: str):
+    pth = _master_path(symbol)
+    df = pd.read_csv(pth)
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.tz_localize(None).dt.normalize()
+    for col in ("OpeningTrend","OpenLocation","PrevDayContext","Result"):
+        if col in df.columns:
+            df[col] = (df[col].astype(str).str.strip().str.upper().replace({"NAN": ""}))
     return df
 
 def _today(df_i: pd.DataFrame) -> pd.Timestamp:
@@ -77,43 +82,3 @@ def compute_all_tags(symbols=None, date_target=None):
         except Exception as e:
             out[s] = {"error": str(e)}
     return out
-
-
-# === TZ-SAFE OVERRIDES (last wins) ===
-import pandas as _pd
-
-def _to_naive_ist(dtser):
-    dt = _pd.to_datetime(dtser, errors="coerce", utc=False)
-    if _pd.api.types.is_datetime64tz_dtype(dt):
-        try:
-            dt = dt.dt.tz_convert("Asia/Kolkata")
-        except Exception:
-            pass
-        dt = dt.dt.tz_localize(None)
-    return dt
-
-def _read_intraday(symbol: str):
-    pth = _intraday_path(symbol)
-    df = _pd.read_csv(pth)
-    if "DateTime" in df.columns:
-        dt = _to_naive_ist(df["DateTime"])
-    elif "Date" in df.columns:
-        dt = _to_naive_ist(df["Date"])
-    else:
-        raise ValueError("intraday csv must have DateTime or Date")
-    df["DateTime"] = dt
-    df["Date"] = dt.dt.normalize()
-    for k in ("Open","High","Low","Close","Ticks","Volume"):
-        if k in df.columns:
-            df[k] = _pd.to_numeric(df[k], errors="coerce")
-    df = df.dropna(subset=["DateTime","Open","High","Low","Close"]).sort_values("DateTime").reset_index(drop=True)
-    return df
-
-def _read_master(symbol: str):
-    pth = _master_path(symbol)
-    df = _pd.read_csv(pth)
-    df["Date"] = _pd.to_datetime(df["Date"], errors="coerce").dt.tz_localize(None).dt.normalize()
-    for col in ("OpeningTrend","OpenLocation","PrevDayContext","Result"):
-        if col in df.columns:
-            df[col] = (df[col].astype(str).str.strip().str.upper().replace({"NAN": ""}))
-    return df
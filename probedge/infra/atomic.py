@@ -1,14 +1,34 @@
 """
-Atomic JSON write helper.
+Atomic JSON / CSV write helpers.
 
-Use this instead of direct open(path, "w") to avoid partial/corrupt files.
+Use these instead of direct open(path, "w") / df.to_csv(path) to avoid
+partial/corrupt files.
 """
 
 import os
 import json
+import stat
 import tempfile
 from typing import Any, Dict
 
+import pandas as pd
+
+# Process umask, read once at import (os.umask can only be read by setting it).
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _target_mode(path: str) -> int:
+    """
+    Permission bits for the file replacing `path`: keep the existing file's
+    mode, else what a plain open() would create. mkstemp's own 0600 would
+    otherwise survive os.replace and lock out other readers.
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
 
 def atomic_json_write(path: str, data: Dict[str, Any]) -> None:
     """
@@ -32,6 +52,7 @@ def atomic_json_write(path: str, data: Dict[str, Any]) -> None:
             json.dump(data, f, indent=2, sort_keys=True)
             f.flush()
             os.fsync(f.fileno())
+        os.chmod(tmp_path, _target_mode(path))
         os.replace(tmp_path, path)
     finally:
         # In case of any exception before replace
@@ -40,3 +61,52 @@ def atomic_json_write(path: str, data: Dict[str, Any]) -> None:
                 os.remove(tmp_path)
             except OSError:
                 pass
+
+
+def atomic_csv_write(path: str, df: pd.DataFrame, **to_csv_kwargs: Any) -> bool:
+    """
+    Write a DataFrame to CSV at `path` atomically:
+      - serialize once in memory
+      - skip the write entirely if `path` already holds identical bytes
+      - otherwise mkstemp in the same directory (same filesystem, no temp dir)
+      - fsync
+      - os.replace to final path
+
+    Same-directory temp + os.replace means a plain rename, never a
+    cross-filesystem copy. Returns True if the file was (re)written.
+    """
+    to_csv_kwargs.setdefault("index", False)
+    payload = df.to_csv(None, **to_csv_kwargs).encode("utf-8")
+
+    # Unchanged content: leave the file (and its mtime) alone so mtime-keyed
+    # readers keep their cached parse.
+    try:
+        if os.path.getsize(path) == len(payload):
+            with open(path, "rb") as f:
+                if f.read() == payload:
+                    return False
+    except OSError:
+        pass
+
+    directory = os.path.dirname(os.path.abspath(path)) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory,
+        prefix=".tmp_csv_",
+        suffix=".csv",
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _target_mode(path))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return True
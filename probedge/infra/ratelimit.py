@@ -0,0 +1,30 @@
+"""
+Thread-safe request spacing for rate-limited broker APIs.
+"""
+
+import threading
+import time
+
+# Kite historical API allows ~3 requests/second per key.
+KITE_HIST_RPS = 3.0
+
+
+class RateLimiter:
+    """Thread-safe spacing limiter: at most `rate` calls per second."""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / float(rate)
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# One limiter per process for every kite.historical_data caller.
+kite_hist_limiter = RateLimiter(KITE_HIST_RPS)
@@ -1,36 +1,50 @@
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from zoneinfo import ZoneInfo
 import argparse
+from datetime import date, datetime
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
-from pandas.api.types import is_datetime64tz_dtype
 from kiteconnect import KiteConnect
 from dotenv import load_dotenv
 
 from probedge.infra.settings import SETTINGS
+from probedge.infra.atomic import atomic_csv_write
+from probedge.infra.ratelimit import kite_hist_limiter
 
 # ------------------------------------------------------
 # 1) ENV + Kite init
 # ------------------------------------------------------
 ROOT = Path(__file__).resolve().parents[1]  # .../probedge/probedge
 dotenv_path = ROOT / ".env"
-load_dotenv(dotenv_path)
 
-api_key = os.getenv("KITE_API_KEY")
-acc_tok = os.getenv("KITE_ACCESS_TOKEN")
 
-if not api_key or not acc_tok:
-    raise RuntimeError("KITE_API_KEY / KITE_ACCESS_TOKEN missing in .env")
+@lru_cache(maxsize=1)
+def get_kite() -> KiteConnect:
+    """
+    Kite client from .env, created on first use so importing this module
+    (for its helpers, or `--help`) has no side effects.
+    """
+    load_dotenv(dotenv_path)
+    api_key = os.getenv("KITE_API_KEY")
+    acc_tok = os.getenv("KITE_ACCESS_TOKEN")
+
+    if not api_key or not acc_tok:
+        raise RuntimeError("KITE_API_KEY / KITE_ACCESS_TOKEN missing in .env")
+
+    kite = KiteConnect(api_key=api_key)
+    kite.set_access_token(acc_tok)
+    return kite
 
-kite = KiteConnect(api_key=api_key)
-kite.set_access_token(acc_tok)
 
 # ------------------------------------------------------
 # 2) Paths (HARD-CODED to data/intraday)
 # ------------------------------------------------------
 INTRA_DIR = ROOT / "data" / "intraday"
-INTRA_DIR.mkdir(parents=True, exist_ok=True)
 
 # ------------------------------------------------------
 # 3) symbol_map + overrides (TMPV)
@@ -40,9 +54,40 @@ sym_map_path = ROOT / "config" / "symbol_map.json"
 if sym_map_path.exists():
     mp = json.loads(sym_map_path.read_text())
 
-print("Downloading NSE instruments…")
-instruments = kite.instruments("NSE")
-by_ts = {row["tradingsymbol"].upper(): row for row in instruments}
+# The NSE instruments dump is several MB and only changes day to day, so
+# keep one copy per calendar day (tradingsymbol + token only).
+INSTR_CACHE_DIR = ROOT / "data" / "config"
+
+
+def _load_nse_instruments() -> pd.DataFrame:
+    cache = INSTR_CACHE_DIR / f"nse_instruments_{date.today():%Y%m%d}.csv"
+    if cache.exists():
+        return pd.read_csv(
+            cache,
+            dtype={"tradingsymbol": str, "instrument_token": "int64"},
+            keep_default_na=False,
+        )
+
+    print("Downloading NSE instruments…")
+    rows = get_kite().instruments("NSE")
+    df = pd.DataFrame(rows, columns=["tradingsymbol", "instrument_token"])
+    atomic_csv_write(str(cache), df, index=False)
+    for old in INSTR_CACHE_DIR.glob("nse_instruments_*.csv"):
+        if old != cache:
+            old.unlink(missing_ok=True)
+    return df
+
+
+@lru_cache(maxsize=1)
+def token_by_ts() -> pd.Series:
+    """UPPER(tradingsymbol) -> instrument_token (last row wins on duplicates).
+
+    Loaded on first use so importing the module / `--help` never hits Kite.
+    """
+    df = _load_nse_instruments()
+    ts = df["tradingsymbol"].astype(str).str.upper()
+    tokens = pd.Series(df["instrument_token"].astype("int64").to_numpy(), index=ts)
+    return tokens[~tokens.index.duplicated(keep="last")]
 
 # Logical-symbol → hard overrides (TATAMOTORS → TMPV)
 SYMBOL_TS_OVERRIDE = {
@@ -50,6 +95,7 @@ SYMBOL_TS_OVERRIDE = {
 }
 
 
+@lru_cache(maxsize=None)
 def resolve_tradingsymbol(sym: str) -> str:
     """
     Resolve our logical symbol (e.g. TATAMOTORS) to a Kite tradingsymbol,
@@ -71,12 +117,13 @@ def resolve_tradingsymbol(sym: str) -> str:
     return ts
 
 
+@lru_cache(maxsize=None)
 def instrument_token_for(sym: str) -> int:
     ts = resolve_tradingsymbol(sym)
-    row = by_ts.get(ts)
-    if not row:
-        raise ValueError(f"Tradingsymbol not found on NSE: {ts} (for {sym})")
-    return int(row["instrument_token"])
+    try:
+        return int(token_by_ts().at[ts])
+    except KeyError:
+        raise ValueError(f"Tradingsymbol not found on NSE: {ts} (for {sym})") from None
 
 
 def path_for(sym: str) -> Path:
@@ -84,9 +131,52 @@ def path_for(sym: str) -> Path:
     return INTRA_DIR / f"{sym}_5minute.csv"
 
 
+def days_path_for(path: Path) -> Path:
+    # Sidecar listing the YYYY-MM-DD days already fetched for <SYM>_5minute.csv:
+    # days with rows, plus past weekdays Kite returned no bars for (exchange
+    # holidays), so those are not re-requested on every run.
+    return path.with_name(path.stem + ".days.txt")
+
+
+def _days_text(keys: np.ndarray) -> str:
+    # epoch-day int64 keys -> sidecar text, one YYYY-MM-DD per line
+    return "\n".join(np.datetime_as_string(keys.astype("datetime64[D]"), unit="D")) + "\n"
+
+
+def read_days_sidecar(path: Path):
+    """
+    Sorted unique epoch-day int64 keys from the sidecar, or None when it is
+    missing or older than the CSV (someone else rewrote the file since our
+    last write).
+    """
+    side = days_path_for(path)
+    try:
+        if side.stat().st_mtime_ns < path.stat().st_mtime_ns:
+            return None
+        days = np.array(side.read_text().split(), dtype="datetime64[D]")
+    except (OSError, ValueError):
+        return None
+    return np.unique(days.view("int64"))
+
+
 # ------------------------------------------------------
 # 4) Existing CSV normalisation
 # ------------------------------------------------------
+# This script writes DateTime as "YYYY-MM-DDTHH:MM:SS+05:30"; parse that with
+# a fixed format and only fall back to per-row inference for anything else.
+ISO_IST_FMT = "%Y-%m-%dT%H:%M:%S%z"
+
+
+def _parse_datetime(s: pd.Series) -> pd.Series:
+    try:
+        dt = pd.to_datetime(s, format=ISO_IST_FMT, errors="coerce")
+    except ValueError:
+        dt = None
+    if dt is None or dt.isna().sum() > s.isna().sum():
+        dt = pd.to_datetime(s, errors="coerce")
+    return dt
+
+
 def unify_existing(path: Path) -> pd.DataFrame:
     """
     Read existing intraday CSV in either:
@@ -106,19 +196,22 @@ def unify_existing(path: Path) -> pd.DataFrame:
 
     # Legacy schema: "date,open,high,low,close,volume"
     if "date" in cur.columns and "open" in cur.columns:
-        dt = pd.to_datetime(cur["date"], errors="coerce")
-        cur["DateTime"] = dt
-        cur["Open"] = cur["open"]
-        cur["High"] = cur["high"]
-        cur["Low"] = cur["low"]
-        cur["Close"] = cur["close"]
-        cur["Volume"] = cur["volume"]
+        cur = cur.rename(
+            columns={
+                "open": "Open",
+                "high": "High",
+                "low": "Low",
+                "close": "Close",
+                "volume": "Volume",
+            }
+        )
+        cur["DateTime"] = pd.to_datetime(cur["date"], errors="coerce")
 
     # Newer schema: "DateTime,Open,High,Low,Close,Volume"
     elif "DateTime" in cur.columns:
-        dt = pd.to_datetime(cur["DateTime"], errors="coerce")
+        dt = _parse_datetime(cur["DateTime"])
         # If tz-aware (e.g. +05:30 strings) → convert to naive Asia/Kolkata
-        if is_datetime64tz_dtype(dt.dtype):
+        if isinstance(dt.dtype, pd.DatetimeTZDtype):
             dt = dt.dt.tz_convert("Asia/Kolkata").dt.tz_localize(None)
         cur["DateTime"] = dt
         if "Open" not in cur.columns or "High" not in cur.columns:
@@ -134,36 +227,44 @@ def unify_existing(path: Path) -> pd.DataFrame:
 
 
 # ------------------------------------------------------
-# 5) Kite fetch for one day
+# 5) Kite fetch for a day range
 # ------------------------------------------------------
-def fetch_day(token: int, day: pd.Timestamp) -> pd.DataFrame:
+# Range fetches run on a small thread pool and every call goes through the
+# process-wide Kite historical limiter (KITE_HIST_RPS req/s).
+FETCH_WORKERS = 3
+# Calendar days per 5minute historical_data request (same window as
+# apps/runtime/rebuild_intraday_5min_from_kite).
+KITE_5MIN_MAX_DAYS = 60
+IST = ZoneInfo("Asia/Kolkata")
+
+
+def fetch_range(token: int, start: pd.Timestamp, end: pd.Timestamp) -> list:
     """
-    Pull 1-minute data for one day and convert to our schema.
-    We keep 1-min bars; 5-min aggregation is done later by read_tm5_csv.
+    Pull 5-minute bars for [start 09:00, end 15:30] IST in one request.
+    Returns Kite's raw list of bar dicts; see bars_to_frame for our schema.
+    Callers keep the span within KITE_5MIN_MAX_DAYS.
     """
-    fr = (
-        pd.Timestamp(day)
-        .tz_localize("Asia/Kolkata")
-        .replace(hour=9, minute=0, second=0, microsecond=0)
-    )
-    to = (
-        pd.Timestamp(day)
-        .tz_localize("Asia/Kolkata")
-        .replace(hour=15, minute=30, second=0, microsecond=0)
-    )
+    fr = datetime(start.year, start.month, start.day, 9, 0, tzinfo=IST)
+    to = datetime(end.year, end.month, end.day, 15, 30, tzinfo=IST)
 
-    data = kite.historical_data(
+    kite_hist_limiter.wait()
+    data = get_kite().historical_data(
         token,
-        fr.to_pydatetime(),
-        to.to_pydatetime(),
-        interval="minute",
+        fr,
+        to,
+        interval="5minute",
         continuous=False,
         oi=False,
     )
-    if not data:
+    return data or []
+
+
+def bars_to_frame(rows: list) -> pd.DataFrame:
+    """All raw Kite bars of a symbol -> one DataFrame in our schema."""
+    if not rows:
         return pd.DataFrame()
 
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(rows)
     dt = pd.to_datetime(df["date"]).dt.tz_convert("Asia/Kolkata").dt.tz_localize(None)
     df["DateTime"] = dt
     df = df.rename(
@@ -184,22 +285,178 @@ def fetch_day(token: int, day: pd.Timestamp) -> pd.DataFrame:
 # ------------------------------------------------------
 # 6) Calendar: last N business days
 # ------------------------------------------------------
-def last_n_bdays(n: int):
-    today = pd.Timestamp.today(tz="Asia/Kolkata").normalize().tz_localize(None)
-    start = today - pd.Timedelta(days=int(n * 2))
-    return pd.date_range(start, today, freq="B").date
+def last_n_bdays(n: int) -> np.ndarray:
+    """Weekdays in the last ~2n calendar days up to today (IST), as datetime64[D]."""
+    today = np.datetime64(pd.Timestamp.today(tz="Asia/Kolkata").date(), "D")
+    days = np.arange(today - int(n * 2), today + 1, dtype="datetime64[D]")
+    return days[np.is_busday(days)]
+
+
+def fetch_windows(todo: list) -> list:
+    """
+    Group sorted missing days into spans of at most KITE_5MIN_MAX_DAYS
+    calendar days, one historical_data request each. Returns lists of days.
+    """
+    spans: list = []
+    for d in todo:
+        if spans and (d - spans[-1][0]).days < KITE_5MIN_MAX_DAYS:
+            spans[-1].append(d)
+        else:
+            spans.append([d])
+    return spans
+
+
+# ------------------------------------------------------
+# 7) Merge fetched days into existing history
+# ------------------------------------------------------
+def _sort_dedup(df: pd.DataFrame) -> pd.DataFrame:
+    # One stable argsort on int64 timestamps; within equal timestamps the last
+    # occurrence (most recently fetched) is kept.
+    df = df.dropna(subset=["DateTime", "Open", "High", "Low", "Close"])
+    ns = df["DateTime"].to_numpy(dtype="datetime64[ns]").view("int64")
+    order = np.argsort(ns, kind="stable")
+    ns_sorted = ns[order]
+    keep = np.r_[ns_sorted[1:] != ns_sorted[:-1], True][: len(ns_sorted)]
+    return df.iloc[order[keep]].reset_index(drop=True)
+
+
+def merge_new_bars(cur: pd.DataFrame, adds: list) -> pd.DataFrame:
+    """
+    Append fetched day frames to the existing history.
+
+    The file on disk is normally already sorted/unique and backfilled days
+    are usually newer than its last bar, so only the (small) new slice is
+    sorted/de-duped and appended. Falls back to a full sort+dedup when the
+    history is out of order or the new bars overlap it.
+    """
+    base = cur
+    if not base.empty and not (
+        base["DateTime"].is_monotonic_increasing and base["DateTime"].is_unique
+    ):
+        base = _sort_dedup(base)
+
+    if not adds:
+        return base
+
+    add = _sort_dedup(pd.concat(adds, ignore_index=True))
+    if base.empty:
+        return add
+    if add.empty:
+        return base
+    if add["DateTime"].iloc[0] > base["DateTime"].iloc[-1]:
+        return pd.concat([base, add], ignore_index=True)
+
+    # New bars land inside existing history (gap fill): full merge.
+    return _sort_dedup(pd.concat([base, add], ignore_index=True))
+
+
+def _format_for_csv(df: pd.DataFrame) -> None:
+    # In place: DateTime as ISO string with +05:30, Date as YYYY-MM-DD.
+    df["DateTime"] = np.char.add(
+        np.datetime_as_string(df["DateTime"].to_numpy(dtype="datetime64[s]"), unit="s"),
+        "+05:30",
+    )
+    df["Date"] = df["Date"].to_numpy(dtype="datetime64[D]").astype(str)
+
+
+def _write_symbol(sym: str, path: Path, cur, futs: list, have: np.ndarray) -> None:
+    """
+    Merge fetched bars into <SYM>_5minute.csv. `cur=None` means append-only:
+    the file is ours (fresh day sidecar) and every new day is after its last
+    known day, so only the new rows are written. `have` is the epoch-day
+    keys already fetched (sidecar and/or CSV).
+    """
+    # Accumulate raw bars from every span and build a single frame.
+    raw: list = []
+    wanted: list = []
+    for span, fut in futs:
+        try:
+            raw.extend(fut.result())
+            wanted.extend(span)
+        except Exception as e:
+            print(f"[{sym}] {span[0].date()}..{span[-1].date()} fetch ERR {e}")
+
+    add = bars_to_frame(raw)
+    if not add.empty:
+        # Spans also cover days we already have; keep only the missing ones.
+        add = add[add["Date"].isin(wanted)]
+    adds = [add] if not add.empty else []
+
+    # Past days Kite answered for count as fetched even with no bars
+    # (holidays); today may still be filling in, so it only counts with rows.
+    today = np.datetime64(pd.Timestamp.today(tz="Asia/Kolkata").date(), "D")
+    done = np.array([d.date() for d in wanted], dtype="datetime64[D]")
+    done = done[done < today].astype("int64")
+
+    if cur is None:
+        if not add.empty:
+            add = _sort_dedup(add)
+            _format_for_csv(add)
+            add.to_csv(path, mode="a", header=False, index=False)
+            done = np.union1d(
+                done, np.array(add["Date"].unique(), dtype="datetime64[D]").astype("int64")
+            )
+        new_keys = np.setdiff1d(done, have)
+        if new_keys.size:
+            with days_path_for(path).open("a") as f:
+                f.write(_days_text(new_keys))
+        if add.empty:
+            print(f"[{sym}] no new bars fetched → {path}")
+        else:
+            print(f"[{sym}] appended {len(add)} rows → {path}")
+        return
+
+    new = merge_new_bars(cur, adds)
+
+    if new.empty:
+        print(f"[{sym}] no data written (still empty)")
+        return
+
+    # `new` is not used after this, so format its columns in place.
+    _format_for_csv(new)
+    new.to_csv(path, index=False)
+    keys = np.array(new["Date"].unique(), dtype="datetime64[D]").astype("int64")
+    days_path_for(path).write_text(_days_text(np.union1d(np.union1d(keys, done), have)))
+
+    added_rows = sum(len(a) for a in adds) if adds else 0
+    print(f"[{sym}] intraday rows={len(new)} (added {added_rows}) → {path}")
 
 
 # ------------------------------------------------------
-# 7) Main backfill
+# 8) Main backfill
 # ------------------------------------------------------
 def main():
     parser = argparse.ArgumentParser(description="Backfill intraday via Kite")
     parser.add_argument("--days", type=int, default=120, help="Number of recent business days")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=FETCH_WORKERS,
+        help="Concurrent Kite day fetches (still capped at KITE_HIST_RPS req/s)",
+    )
+    parser.add_argument(
+        "--rewrite",
+        action="store_true",
+        help="Always re-read and rewrite the whole CSV instead of appending",
+    )
     args = parser.parse_args()
 
-    days = [pd.Timestamp(d) for d in last_n_bdays(args.days)]
+    get_kite()  # fail fast on missing credentials, before any work
+    INTRA_DIR.mkdir(parents=True, exist_ok=True)
 
+    day_arr = last_n_bdays(args.days)
+    days = [pd.Timestamp(d) for d in day_arr]
+    # Epoch-day int64 keys: the missing-day mask is one np.isin per symbol.
+    day_keys = day_arr.view("int64")
+
+    def missing_days(have: np.ndarray) -> list:
+        mask = ~np.isin(day_keys, have, assume_unique=True)
+        return [d for d, m in zip(days, mask) if m]
+
+    # Resolve every symbol and its missing days first, then push all day
+    # requests through ONE shared (rate-limited) pool so the limiter is never
+    # idle between symbols.
+    jobs = []
     for sym in SETTINGS.symbols:
         try:
             token = instrument_token_for(sym)
@@ -208,48 +465,49 @@ def main():
             continue
 
         path = path_for(sym)
-        cur = unify_existing(path)
-        have = set(cur["Date"].unique()) if not cur.empty else set()
-        adds = []
-
-        for d in days:
-            d_norm = d.normalize()
-            if d_norm in have:
+        # Day sidecar lets an up-to-date symbol skip parsing the whole CSV.
+        have = read_days_sidecar(path)
+        if have is not None:
+            todo = missing_days(have)
+            if not todo:
+                print(f"[{sym}] up to date ({len(have)} days) → {path}")
+                continue
+            # Only newer days missing: append to the file without reading it.
+            # Past holidays are in the sidecar once fetched, so they no longer
+            # look like gaps that force a full rewrite.
+            first_todo = np.datetime64(todo[0].date(), "D").astype("int64")
+            if not args.rewrite and have.size and first_todo > have[-1]:
+                jobs.append((sym, path, None, token, todo, have))
                 continue
-            try:
-                df_d = fetch_day(token, d)
-                if not df_d.empty:
-                    adds.append(df_d)
-            except Exception as e:
-                print(f"[{sym}] {d.date()} fetch ERR {e}")
-
-        if adds:
-            new = (
-                pd.concat([cur] + adds, ignore_index=True)
-                if not cur.empty
-                else pd.concat(adds, ignore_index=True)
-            )
-        else:
-            new = cur
-
-        if new.empty:
-            print(f"[{sym}] no data written (still empty)")
-            continue
 
-        new = (
-            new.dropna(subset=["DateTime", "Open", "High", "Low", "Close"])
-            .sort_values("DateTime")
-            .drop_duplicates("DateTime", keep="last")
+        cur = unify_existing(path)
+        csv_days = (
+            np.unique(cur["Date"].to_numpy(dtype="datetime64[D]").view("int64"))
+            if not cur.empty
+            else np.empty(0, dtype="int64")
         )
-
-        out = new.copy()
-        # Write as ISO string with +05:30, and Date as YYYY-MM-DD
-        out["DateTime"] = out["DateTime"].dt.strftime("%Y-%m-%dT%H:%M:%S+05:30")
-        out["Date"] = pd.to_datetime(out["Date"]).dt.strftime("%Y-%m-%d")
-        out.to_csv(path, index=False)
-
-        added_rows = sum(len(a) for a in adds) if adds else 0
-        print(f"[{sym}] intraday rows={len(new)} (added {added_rows}) → {path}")
+        # A valid sidecar also remembers no-bar days (holidays): keep them.
+        have = csv_days if have is None else np.union1d(csv_days, have)
+        todo = missing_days(have)
+        jobs.append((sym, path, cur, token, todo, have))
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as ex:
+        # Submitted in symbol/span order; results collected in the same order.
+        pending = [
+            (
+                sym,
+                path,
+                cur,
+                [
+                    (span, ex.submit(fetch_range, token, span[0], span[-1]))
+                    for span in fetch_windows(todo)
+                ],
+                have,
+            )
+            for sym, path, cur, token, todo, have in jobs
+        ]
+        for sym, path, cur, futs, have in pending:
+            _write_symbol(sym, path, cur, futs, have)
 
     print("Done backfill.")
 
@@ -1,6 +1,8 @@
 import argparse
 import math
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 from pathlib import Path
 
 from probedge.storage.resolver import locate_for_read
@@ -67,12 +69,22 @@ def debug_symbol_day(symbol: str, day_str: str) -> None:
         print("[TM5] no DateTime column; cannot proceed")
         return
 
-    tm5["DateTime"] = pd.to_datetime(tm5["DateTime"], errors="coerce")
+    # read_tm5_csv already parsed DateTime; only coerce if it did not.
+    if not is_datetime64_any_dtype(tm5["DateTime"]):
+        tm5["DateTime"] = pd.to_datetime(tm5["DateTime"], errors="coerce")
     tm5 = tm5.dropna(subset=["DateTime"])
-    tm5["Date"] = tm5["DateTime"].dt.date
+    # Day key as int32 epoch-days (IST wall clock): day matching is an
+    # integer compare instead of per-row datetime.date objects.
+    wall = tm5["DateTime"]
+    if isinstance(wall.dtype, pd.DatetimeTZDtype):
+        wall = wall.dt.tz_localize(None)
+    tm5["DayInt"] = wall.to_numpy(dtype="datetime64[D]").view("int64").astype("int32")
+    day_int = int(np.datetime64(day_date, "D").astype("int64"))
+    # Row positions per day, computed once; slices below are plain takes.
+    day_idx = tm5.groupby("DayInt").indices
 
     # Slice day
-    df_day = tm5[tm5["Date"] == day_date].copy()
+    df_day = tm5.take(day_idx.get(day_int, np.empty(0, dtype=np.intp)))
     print(f"[TM5] Rows for {sym} on {day_date}: {len(df_day)}")
     if df_day.empty:
         print("[TM5] no intraday rows for this day; stop")
@@ -81,18 +93,21 @@ def debug_symbol_day(symbol: str, day_str: str) -> None:
     print(df_day[["DateTime", "Open", "High", "Low", "Close"]].head())
     print("... ORB window (09:15–09:35 approx):")
 
-    day_idx = df_day.set_index("DateTime").sort_index()
-    try:
-        orb = day_idx.between_time("09:15", "09:35")
-    except TypeError:
-        orb = day_idx
+    # The TM5 loader returns bars sorted by DateTime with `_mins` (minutes
+    # since midnight) precomputed; 09:15 = 555, 09:35 = 575.
+    mins = df_day["_mins"].to_numpy()
+    orb = df_day.iloc[np.flatnonzero((mins >= 555) & (mins <= 575))]
+    orb = orb.set_index("DateTime")
     print(orb[["Open", "High", "Low", "Close"]].head(25))
 
     # --- Prev-day OHLC: naive from TM5 by grouping ---
-    prev_days = sorted(d for d in tm5["Date"].unique() if d < day_date)
-    if prev_days:
-        prev_date = prev_days[-1]
-        prev_df = tm5[tm5["Date"] == prev_date].copy()
+    # Sorted trading days; the prior one is a binary search away.
+    unique_days = np.sort(np.fromiter(day_idx, dtype=np.int64, count=len(day_idx)))
+    k_prev = int(np.searchsorted(unique_days, day_int)) - 1
+    if k_prev >= 0:
+        prev_int = int(unique_days[k_prev])
+        prev_date = np.datetime64(int(prev_int), "D").astype(object)
+        prev_df = tm5.take(day_idx[prev_int])
         prev_open = float(prev_df["Open"].iloc[0])
         prev_high = float(prev_df["High"].max())
         prev_low = float(prev_df["Low"].min())
@@ -126,25 +141,24 @@ def debug_symbol_day(symbol: str, day_str: str) -> None:
     print(f"[SIMPLE] PDC from simple rule (using C.prev_ohlc) -> {simple_pdc}")
 
     # --- MASTER row for this date ---
-    from probedge.storage.resolver import locate_for_read as _loc_master
-    import pandas as _pd
-
-    p_master = _loc_master("masters", sym)
+    p_master = locate_for_read("masters", sym)
     master_row = None
     print("\n=== MASTER row ===")
     if not p_master.exists():
         print(f"[MASTER] file not found for {sym}: {p_master}")
     else:
-        m = _pd.read_csv(p_master)
+        m = pd.read_csv(p_master)
         if "Date" not in m.columns:
             print("[MASTER] no Date column; cannot match day")
         else:
-            m["Date"] = _pd.to_datetime(m["Date"], errors="coerce").dt.date
-            mm = m[m["Date"] == day_date]
+            # match on normalized datetime64 (no per-row date objects)
+            m_date = pd.to_datetime(m["Date"], errors="coerce").dt.normalize()
+            mm = m[m_date == day_ts.normalize()]
             if mm.empty:
                 print(f"[MASTER] no row for {day_date}")
             else:
                 master_row = mm.iloc[0].to_dict()
+                master_row["Date"] = day_date
                 print(f"[MASTER] {master_row}")
 
     # --- Planner view ---
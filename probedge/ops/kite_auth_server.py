@@ -1,5 +1,6 @@
 # ops/kite_auth_server.py
-import os, re
+import asyncio
+import os
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse, PlainTextResponse
@@ -20,20 +21,21 @@ if not API_KEY or not API_SECRET:
 app = FastAPI()
 kite = KiteConnect(api_key=API_KEY)
 
-def _upsert_env_line(text: str, key: str, value: str) -> str:
-    # ensures KEY=value exists (replace if present, append otherwise)
-    lines = [] if not text else text.splitlines()
-    pat = re.compile(rf"^{re.escape(key)}=")
-    found = False
+def _upsert_env(text: str, updates: dict) -> str:
+    # ensures KEY=value exists for every key in one pass over the file
+    # (replace if present, append missing keys in `updates` order)
     new_lines = []
-    for ln in lines:
-        if pat.match(ln):
-            new_lines.append(f"{key}={value}")
-            found = True
+    seen = set()
+    for ln in ([] if not text else text.splitlines()):
+        key = ln.split("=", 1)[0] if "=" in ln else None
+        if key in updates:
+            new_lines.append(f"{key}={updates[key]}")
+            seen.add(key)
         else:
             new_lines.append(ln)
-    if not found:
-        new_lines.append(f"{key}={value}")
+    for key, value in updates.items():
+        if key not in seen:
+            new_lines.append(f"{key}={value}")
     return "\n".join(new_lines) + "\n"
 
 @app.get("/")
@@ -46,24 +48,35 @@ def index():
     """
     return HTMLResponse(html)
 
+def _save_token(access: str) -> None:
+    # 1) Save clean token file
+    (OUT / "kite_access_token.txt").write_text(access)
+
+    # 2) Update .env so next processes auto-pick it
+    old_env = ENV.read_text() if ENV.exists() else ""
+    env_txt = _upsert_env(
+        old_env,
+        {
+            "KITE_API_KEY": API_KEY,
+            "KITE_API_SECRET": API_SECRET,
+            "KITE_REDIRECT_URL": REDIRECT,
+            "KITE_ACCESS_TOKEN": access,
+        },
+    )
+    if env_txt != old_env:
+        ENV.write_text(env_txt)
+
 @app.get("/callback")
-def callback(request_token: str = ""):
+async def callback(request_token: str = ""):
     if not request_token:
         return PlainTextResponse("Missing request_token", status_code=400)
     try:
-        sess = kite.generate_session(request_token, api_secret=API_SECRET)
+        # blocking HTTPS call + file IO: keep them off the event loop
+        sess = await asyncio.to_thread(
+            kite.generate_session, request_token, api_secret=API_SECRET
+        )
         access = sess["access_token"]
-
-        # 1) Save clean token file
-        (OUT / "kite_access_token.txt").write_text(access)
-
-        # 2) Update .env so next processes auto-pick it
-        env_txt = ENV.read_text() if ENV.exists() else ""
-        env_txt = _upsert_env_line(env_txt, "KITE_API_KEY", API_KEY)
-        env_txt = _upsert_env_line(env_txt, "KITE_API_SECRET", API_SECRET)
-        env_txt = _upsert_env_line(env_txt, "KITE_REDIRECT_URL", REDIRECT)
-        env_txt = _upsert_env_line(env_txt, "KITE_ACCESS_TOKEN", access)
-        ENV.write_text(env_txt)
+        await asyncio.to_thread(_save_token, access)
 
         # 3) Show copy-paste exports for current shell session
         html = f"""
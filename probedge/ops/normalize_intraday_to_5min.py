@@ -1,5 +1,6 @@
 # ops/normalize_intraday_to_5min.py
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from probedge.infra.settings import SETTINGS
@@ -43,8 +44,11 @@ def normalize_symbol(sym: str) -> None:
     out["Date"] = out["DateTime"].dt.normalize()
 
     # --- format back to your standard strings ---
-    out["DateTime"] = out["DateTime"].dt.strftime("%Y-%m-%dT%H:%M:%S+05:30")
-    out["Date"] = pd.to_datetime(out["Date"]).dt.strftime("%Y-%m-%d")
+    out["DateTime"] = np.char.add(
+        np.datetime_as_string(out["DateTime"].to_numpy(dtype="datetime64[s]"), unit="s"),
+        "+05:30",
+    )
+    out["Date"] = out["Date"].to_numpy(dtype="datetime64[D]").astype(str)
 
     out = out[["DateTime", "Open", "High", "Low", "Close", "Volume", "Date"]]
 
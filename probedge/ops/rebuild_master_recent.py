@@ -1,7 +1,12 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
 from probedge.infra.settings import SETTINGS
+from probedge.infra.atomic import atomic_csv_write
 from probedge.decision.tags_engine import _read_intraday, _read_master
 from probedge.core import classifiers as C
 
@@ -12,45 +17,88 @@ MAST.mkdir(parents=True, exist_ok=True)
 # How many recent trading days to rebuild for each symbol
 N_DAYS = 120
 
-for s in SETTINGS.symbols:
+
+def _prev_ohlc_by_day(i: pd.DataFrame) -> dict:
+    """
+    {day: prev-day OHLC dict or None} for every intraday day, in one pass.
+
+    Same rules as C.prev_trading_day_ohlc (nearest earlier day within 7
+    calendar days; open/close of that day's first/last bar by DateTime), which
+    otherwise rescans the whole intraday frame for every day. Expects the
+    `_read_intraday` frame: sorted by DateTime, no NaN OHLC.
+    """
+    dates = i["Date"].to_numpy()
+    if not len(dates):
+        return {}
+    # Days are contiguous blocks of the sorted frame: reduce each block in C
+    # from its start offset instead of going through groupby.
+    starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+    ends = np.r_[starts[1:], len(dates)] - 1
+    dt = i["DateTime"].to_numpy()
+    # close = first bar stamped at the day's last DateTime
+    close_at = np.searchsorted(dt, dt[ends], side="left")
+
+    opens = i["Open"].to_numpy(dtype=float)[starts]
+    highs = np.maximum.reduceat(i["High"].to_numpy(dtype=float), starts)
+    lows = np.minimum.reduceat(i["Low"].to_numpy(dtype=float), starts)
+    closes = i["Close"].to_numpy(dtype=float)[close_at]
+
+    days = dates[starts]
+    near = np.r_[False, (days[1:] - days[:-1]) <= np.timedelta64(7, "D")]
+
+    out = {}
+    for k, d in enumerate(pd.DatetimeIndex(days)):
+        if near[k]:
+            out[d] = {
+                "open": float(opens[k - 1]),
+                "high": float(highs[k - 1]),
+                "low": float(lows[k - 1]),
+                "close": float(closes[k - 1]),
+            }
+        else:
+            out[d] = None
+    return out
+
+
+def rebuild_one(s: str) -> tuple:
+    """Rebuild the last N_DAYS master rows for one symbol; returns (SYM, log lines)."""
     sym = s.upper()
-    print(f"\n=== {sym} ===")
+    log = []
 
     # --- Intraday (TM5) ---
     i = _read_intraday(sym)
     if i.empty:
-        print(f"[{sym}] intraday empty; skip")
-        continue
-
-    # Normalise Date to tz-naive date
-    if "Date" not in i.columns:
-        # some loaders store DateTime only
-        i["Date"] = pd.to_datetime(i["DateTime"], errors="coerce").dt.tz_localize(None).dt.normalize()
-    else:
-        i["Date"] = pd.to_datetime(i["Date"], errors="coerce").dt.tz_localize(None).dt.normalize()
+        log.append(f"[{sym}] intraday empty; skip")
+        return sym, log
 
     # --- Existing MASTER ---
+    # Both readers already return "Date" as tz-naive datetime64 midnights;
+    # keep it that way through the merge and format once at write time.
     m = _read_master(sym)
-    if not m.empty and "Date" in m.columns:
-        m["Date"] = pd.to_datetime(m["Date"], errors="coerce").dt.tz_localize(None).dt.normalize()
 
     # Last N trading days from intraday
     days = sorted(i["Date"].dropna().unique())[-N_DAYS:]
     if not len(days):
-        print(f"[{sym}] no days found in intraday; skip")
-        continue
+        log.append(f"[{sym}] no days found in intraday; skip")
+        return sym, log
 
-    by_day = {d: g.sort_values("DateTime") for d, g in i.groupby("Date")}
+    # `i` is sorted by DateTime, so each day is one contiguous block: slice
+    # it by position instead of materialising a dict of per-day copies.
+    dates = i["Date"].to_numpy()
+    day_vals = np.asarray(days, dtype=dates.dtype)
+    lo = np.searchsorted(dates, day_vals, side="left")
+    hi = np.searchsorted(dates, day_vals, side="right")
+    prev_by_day = _prev_ohlc_by_day(i)
 
     rows = []
-    for d in days:
+    for k, d in enumerate(days):
         try:
             # Prev-day OHLC, tags + result using the SAME classifiers as backtest
-            prev = C.prev_trading_day_ohlc(i, d)
+            prev = prev_by_day.get(pd.Timestamp(d))
             pdc = C.compute_prevdaycontext_robust(prev)
             ol = C.compute_openlocation_from_df(i, d, prev)
             ot = C.compute_openingtrend_robust(i, d)
-            lab, _ = C.compute_result_0940_1505(by_day.get(d, pd.DataFrame()))
+            lab, _ = C.compute_result_0940_1505(i.iloc[lo[k]:hi[k]])
 
             rows.append(
                 {
@@ -62,27 +110,76 @@ for s in SETTINGS.symbols:
                 }
             )
         except Exception as e:
-            print(f"[{sym}] {pd.Timestamp(d).date()} ERR {e}")
+            log.append(f"[{sym}] {pd.Timestamp(d).date()} ERR {e}")
 
     add = pd.DataFrame(rows)
     if add.empty:
-        print(f"[{sym}] no new rows built; skip write")
-        continue
+        log.append(f"[{sym}] no new rows built; skip write")
+        return sym, log
 
     # Merge with existing MASTER: keep old rows where Date not in "add", then append "add"
     if m.empty:
-        out = add.copy()
+        out = add  # only len(add) is used after this; no need to copy
     else:
-        out = pd.concat(
-            [m[~m["Date"].isin(add["Date"])], add],
-            ignore_index=True,
-        ).sort_values("Date").reset_index(drop=True)
+        # Rebuilt days replace the whole old row (its other columns are
+        # cleared), so drop by key rather than m.update(add).
+        out = (
+            pd.concat(
+                [
+                    m.set_index("Date").drop(index=add["Date"], errors="ignore"),
+                    add.set_index("Date"),
+                ]
+            )
+            .sort_index(kind="mergesort")
+            .reset_index()
+        )
 
     # Ensure Date is written as 'YYYY-MM-DD' (like your existing masters)
-    out["Date"] = pd.to_datetime(out["Date"], errors="coerce").dt.strftime("%Y-%m-%d")
+    dv = out["Date"].to_numpy(dtype="datetime64[D]")
+    out["Date"] = np.where(np.isnat(dv), "", np.datetime_as_string(dv, unit="D"))
 
     # Final column order: keep whatever exists, adding any new tag columns if needed
     # (pandas concat already handles this; we just write out)
     dest = MAST / f"{sym}_5MINUTE_MASTER.csv"
-    out.to_csv(dest, index=False)
-    print(f"[{sym}] master rebuilt/updated: added {len(add)} rows → {dest}")
+    if atomic_csv_write(str(dest), out, index=False):
+        log.append(f"[{sym}] master rebuilt/updated: added {len(add)} rows → {dest}")
+    else:
+        log.append(f"[{sym}] master unchanged; skipped write → {dest}")
+
+    return sym, log
+
+
+def rebuild_all(symbols=None) -> None:
+    """Rebuild recent master rows for `symbols` (default: SETTINGS.symbols)."""
+    symbols = list(SETTINGS.symbols if symbols is None else symbols)
+    if not symbols:
+        return
+    # Symbols are independent and the classifier loop is CPU-bound pandas
+    # code, so fan out over processes; log lines are printed in symbol order.
+    # A failing symbol is reported in its slot; the run fails only after
+    # every symbol's log has been printed.
+    workers = max(1, min(len(symbols), os.cpu_count() or 1))
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs = [(s, ex.submit(rebuild_one, s)) for s in symbols]
+        for s, fut in futs:
+            try:
+                sym, log = fut.result()
+            except Exception as e:
+                sym, log = s.upper(), [f"[{s.upper()}] FAILED: {e!r}"]
+                failed.append((sym, e))
+            print(f"\n=== {sym} ===")
+            for line in log:
+                print(line)
+    if failed:
+        raise RuntimeError(
+            f"master rebuild failed for {', '.join(sym for sym, _ in failed)}"
+        ) from failed[0][1]
+
+
+def main():
+    rebuild_all()
+
+
+if __name__ == "__main__":
+    main()
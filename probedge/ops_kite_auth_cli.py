@@ -29,25 +29,31 @@ from kiteconnect import KiteConnect
 REPO_ROOT = Path(__file__).resolve().parents[0]
 ENV_PATH = REPO_ROOT / ".env"
 
+_ACCESS_TOKEN_RE = re.compile(r"^KITE_ACCESS_TOKEN=.*$", re.MULTILINE)
+
 
 def update_env_access_token(env_path: Path, access_token: str) -> None:
     """Replace or append KITE_ACCESS_TOKEN=... in .env."""
     if env_path.exists():
-        text = env_path.read_text()
+        old = env_path.read_text()
     else:
-        text = ""
+        old = ""
+    text = old
 
     line = f"KITE_ACCESS_TOKEN={access_token}"
 
     if "KITE_ACCESS_TOKEN=" in text:
         # replace existing line
-        text = re.sub(r"^KITE_ACCESS_TOKEN=.*$", line, text, flags=re.MULTILINE)
+        text = _ACCESS_TOKEN_RE.sub(line, text)
     else:
         # append new line
         if not text.endswith("\n"):
             text += "\n"
         text += line + "\n"
 
+    if text == old:
+        print(f"[auth] {env_path} already has this KITE_ACCESS_TOKEN.")
+        return
     env_path.write_text(text)
     print(f"[auth] Updated {env_path} with new KITE_ACCESS_TOKEN.")
 
@@ -186,6 +186,8 @@ def run_agg(symbols: List[str], bar_seconds: int = 300, state_path: Optional[str
 
         quotes_patch: Dict[str, Any] = {}
         last_closed_patch: Dict[str, Any] = {}
+        # Latest (px, ts_ist) per symbol in this batch; quotes are built once per symbol below.
+        last_px: Dict[str, Tuple[float, datetime]] = {}
 
         # 2) Update bars from ticks
         for sym, ts_epoch, ltp in batch:
@@ -228,29 +230,30 @@ def run_agg(symbols: List[str], bar_seconds: int = 300, state_path: Optional[str
                     ohlc = {"o": px, "h": px, "l": px, "c": px}
                     cur_bar[s] = (bucket, ohlc, 0.0)
                 else:
-                    # Update in-progress bar
-                    ohlc["h"] = float(max(ohlc["h"], px))
-                    ohlc["l"] = float(min(ohlc["l"], px))
+                    # Update in-progress bar (ohlc values are already floats)
+                    if px > ohlc["h"]:
+                        ohlc["h"] = px
+                    if px < ohlc["l"]:
+                        ohlc["l"] = px
                     ohlc["c"] = px
-                    cur_bar[s] = (prev_start, ohlc, vol)
 
-            # Quote patch always reflects latest in-progress bar
+            last_px[s] = (px, ts_ist)
+
+        # Quote patch always reflects latest in-progress bar; one dict per symbol per batch
+        for s, (px, ts_ist) in last_px.items():
             _, ohlc, vol = cur_bar[s]
             quotes_patch[s] = {
                 "ltp": px,
-                "ohlc": {
-                    "o": float(ohlc["o"]),
-                    "h": float(ohlc["h"]),
-                    "l": float(ohlc["l"]),
-                    "c": float(ohlc["c"]),
-                },
+                "ohlc": dict(ohlc),
                 "volume": float(vol),
                 "ts_ist": ts_ist.isoformat(),
             }
 
         # 2b) Bar rollover on wall-clock (prevents stale OHLC leaking into later bars)
         expected_bucket = _bar_bucket_start(loop_now, bar_seconds)
-        for s, prev in list(cur_bar.items()):
+        # Only existing keys are re-assigned below (no inserts/deletes), so iterating
+        # the live view is safe and avoids copying the items list every loop.
+        for s, prev in cur_bar.items():
             prev_start, ohlc, vol = prev
             if prev_start == expected_bucket:
                 continue
@@ -1,6 +1,7 @@
 import os, pandas as pd
 from .common import ensure_dir
 from ..infra.settings import SETTINGS
+from ..infra.atomic import atomic_csv_write
 
 LEGACY_CANDIDATES = [
     "data/masters/{sym}_5MINUTE_MASTER_INDICATORS.csv",
@@ -26,5 +27,5 @@ def read(sym: str) -> pd.DataFrame:
 def write(sym: str, df: pd.DataFrame) -> str:
     p = SETTINGS.paths.masters.format(sym=sym)
     ensure_dir(os.path.dirname(p))
-    df.to_csv(p, index=False)
+    atomic_csv_write(p, df, index=False)
     return p
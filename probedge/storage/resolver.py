@@ -1,4 +1,5 @@
 from __future__ import annotations
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple
 from probedge.infra.settings import SETTINGS
@@ -10,20 +11,26 @@ def _canonical_sym(sym: str) -> str:
     s = (sym or "").upper().strip()
     return ALIASES.get(s, s)
 
+# Canonical paths depend only on SETTINGS (fixed for the process), so the
+# resolve() walk is done once per symbol. Existence is still checked live.
+@lru_cache(maxsize=None)
 def intraday_path(sym: str) -> Path:
     s = _canonical_sym(sym)
     # canonical write path
     p = SETTINGS.paths.intraday.format(sym=s)
     return (SETTINGS.data_dir / p).resolve()
 
+@lru_cache(maxsize=None)
 def master_path(sym: str) -> Path:
     s = _canonical_sym(sym)
     p = SETTINGS.paths.masters.format(sym=s)
     return (SETTINGS.data_dir / p).resolve()
 
+@lru_cache(maxsize=None)
 def journal_path() -> Path:
     return (SETTINGS.data_dir / SETTINGS.paths.journal).resolve()
 
+@lru_cache(maxsize=None)
 def state_path() -> Path:
     return (SETTINGS.data_dir / SETTINGS.paths.state).resolve()
 
@@ -38,6 +45,16 @@ LEGACY_PATTERNS = [
     ("masters",  "DATA_DIR/master/{sym}_Master.csv"),
 ]
 
+@lru_cache(maxsize=4096)
+def _legacy_paths(kind: str, sym: str) -> Tuple[Path, ...]:
+    # resolved once per (kind, sym); existence is checked by the caller
+    s = _canonical_sym(sym)
+    return tuple(
+        (SETTINGS.data_dir / pat.format(sym=s)).resolve()
+        for k, pat in LEGACY_PATTERNS
+        if k == kind
+    )
+
 def locate_for_read(kind: str, sym: Optional[str] = None) -> Path:
     """
     kind: 'intraday' | 'masters' | 'journal' | 'state'
@@ -59,11 +76,7 @@ def locate_for_read(kind: str, sym: Optional[str] = None) -> Path:
         return p
 
     # legacy fallbacks (read-only)
-    s = _canonical_sym(sym)
-    for k, pat in LEGACY_PATTERNS:
-        if k != kind:
-            continue
-        lp = (SETTINGS.data_dir / pat.format(sym=s)).resolve()
+    for lp in _legacy_paths(kind, sym):
         if lp.exists():
             return lp
 